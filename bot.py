@@ -1,58 +1,221 @@
 import requests
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection
+from bs4 import BeautifulSoup, SoupStrainer
+import orjson
 import time
 import os
-from datetime import datetime
+import atexit
+import logging
+import sys
+import re
+import signal
+import socket
+import random
+from dataclasses import dataclass, field
+from typing import Optional
+from concurrent.futures import ThreadPoolExecutor
 from twilio.rest import Client
+from twilio.http.http_client import TwilioHttpClient
+
+@dataclass
+class Product:
+    """A product to monitor, plus the state kept between its checks"""
+    url: str
+    name: str
+    api_url: str = ''  # JSON availability endpoint; blank = scrape the page
+    
+    sms_message: str = field(init=False, repr=False)
+    # Conditional-GET headers and verdict from the last full page fetch
+    cond_headers: dict = field(default_factory=dict, init=False, repr=False)
+    last_status: Optional[bool] = field(default=None, init=False, repr=False)
+    previous_status: Optional[bool] = field(default=None, init=False, repr=False)
+    api_retry_at: float = field(default=0.0, init=False, repr=False)
+    # Quiet period after a restock alert; other products keep being checked
+    next_check_at: float = field(default=0.0, init=False, repr=False)
+    
+    def __post_init__(self):
+        self.sms_message = (
+            f"IN STOCK: {self.name}\n"
+            f"{self.url}"
+        )
 
 # ============================================
 # CONFIGURATION - EDIT THESE VALUES
 # ============================================
 
-PRODUCT_URL = "https://www.pokemoncenter.com/product/10-10191-109/pokemon-tcg-mega-evolution-phantasmal-flames-booster-bundle-6-packs"
-PRODUCT_NAME = "Pokemon TCG Mega Evolution Phantasmal Flames Booster Bundle"
-CHECK_INTERVAL = 90  # seconds (90 = 1.5 minutes)
+SITE_URL = "https://www.pokemoncenter.com/"
+COOKIE_FILE = os.environ.get('COOKIE_FILE', '.cookies.json')  # keeps bot-check clearance across restarts
+CHECK_INTERVAL = 90  # seconds (90 = 1.5 minutes), used right after a change
+CHECK_INTERVAL_MAX = 600  # seconds, slowest rate while nothing changes
+LOG_SEPARATOR_EVERY = 20  # checks between separator lines in the log
+CHECK_WORKERS = 8  # products checked at the same time
+# JSON availability endpoint for the default product (find it in DevTools > Network).
+# Leave blank to scrape the product page instead.
+STOCK_API_URL = os.environ.get('STOCK_API_URL', '')
+STOCK_API_RETRY = 1800  # seconds to scrape the page only after the API fails
+# Server-sent events URL that announces restocks (e.g. a restock alert relay).
+# When set, stock is re-checked on each event and polling is only a fallback.
+RESTOCK_FEED_URL = os.environ.get('RESTOCK_FEED_URL', '')
+FEED_MIN_GAP = 30  # seconds; feed events closer together than this are held back
 
 # Twilio Configuration (for SMS notifications)
 TWILIO_ACCOUNT_SID = os.environ.get('TWILIO_ACCOUNT_SID', 'your_account_sid_here')
 TWILIO_AUTH_TOKEN = os.environ.get('TWILIO_AUTH_TOKEN', 'your_auth_token_here')
 TWILIO_PHONE_FROM = os.environ.get('TWILIO_PHONE_FROM', '+1234567890')
 TWILIO_PHONE_TO = os.environ.get('TWILIO_PHONE_TO', '+1234567890')
+SMS_TIMEOUT = 15  # seconds; a hung Twilio call must not hold up shutdown
+RESTOCK_PAUSE = 300  # seconds to stop checking a product after it comes in stock
+
+PRODUCTS = [
+    Product(
+        url="https://www.pokemoncenter.com/product/10-10191-109/pokemon-tcg-mega-evolution-phantasmal-flames-booster-bundle-6-packs",
+        name="Pokemon TCG Mega Evolution Phantasmal Flames Booster Bundle",
+        api_url=STOCK_API_URL,
+    ),
+]
 
 # ============================================
 # BOT CODE
 # ============================================
 
+HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
+    'Accept-Language': 'en-US,en;q=0.5',
+    'Accept-Encoding': 'gzip, deflate, br',
+    'Connection': 'keep-alive',
+    'Upgrade-Insecure-Requests': '1',
+    'Sec-Fetch-Dest': 'document',
+    'Sec-Fetch-Mode': 'navigate',
+    'Sec-Fetch-Site': 'none',
+    'Cache-Control': 'max-age=0'
+}
+API_HEADERS = {'Accept': 'application/json'}
+
+# Normalised 'availability' values from the stock API
+IN_STOCK_VALUES = {'instock', 'available', 'limitedavailability', 'onlineonly'}
+OUT_OF_STOCK_VALUES = {'outofstock', 'notinstock', 'soldout', 'unavailable', 'discontinued', 'preorder'}
+
+# Byte-level probes for the common case, so most checks never build a DOM
+BTN_RE = re.compile(rb'<button[^>]*class="[^"]*add-to-cart[^"]*"[^>]*>(.*?)</button>', re.S | re.I)
+# A standalone `disabled`/`aria-disabled` attribute or class, but not `="false"`
+DISABLED_RE = re.compile(rb'(?<![\w-])(?:aria-)?disabled(?![\w-])(?!\s*=\s*["\']?false)|unavailable', re.I)
+SOLD_OUT_RE = re.compile(rb'out of stock|sold out', re.I)
+
+def is_stock_markup(name, attrs=None):
+    """True for the elements parse_stock() reads; everything else is skipped"""
+    if attrs is None:
+        # Called with a Tag rather than raw parser data
+        name, attrs = name.name, name.attrs
+    css_class = attrs.get('class') or ''
+    if isinstance(css_class, list):
+        css_class = ' '.join(css_class)
+    css_class = css_class.lower()
+    
+    if name == 'button':
+        return 'add-to-cart' in css_class
+    if name == 'p':
+        return 'availability' in css_class
+    if name == 'script':
+        return attrs.get('type') == 'application/ld+json'
+    return False
+
+ONLY_STOCK_MARKUP = SoupStrainer(is_stock_markup)
+
+# Keep the pooled socket alive through the idle gap between checks
+SOCKET_OPTIONS = HTTPConnection.default_socket_options + [(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)]
+if hasattr(socket, 'TCP_KEEPIDLE'):
+    SOCKET_OPTIONS += [
+        (socket.IPPROTO_TCP, socket.TCP_KEEPIDLE, 30),
+        (socket.IPPROTO_TCP, socket.TCP_KEEPINTVL, 15),
+    ]
+
+class KeepAliveAdapter(HTTPAdapter):
+    """HTTPAdapter whose connections use TCP_NODELAY and TCP keep-alive"""
+    def init_poolmanager(self, *args, **kwargs):
+        kwargs['socket_options'] = SOCKET_OPTIONS
+        return super().init_poolmanager(*args, **kwargs)
+
+def make_session():
+    """Create the keep-alive session shared by every product check"""
+    session = requests.Session()
+    # Sized so all concurrent checks reuse pooled connections to the site
+    session.mount('https://', KeepAliveAdapter(pool_connections=4, pool_maxsize=2 * CHECK_WORKERS))
+    # Every request goes out with these, so calls only pass what differs
+    session.headers.update(HEADERS)
+    return session
+
 class PokemonCenterMonitor:
-    def __init__(self):
-        self.session = requests.Session()
-        self.headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-            'Accept-Language': 'en-US,en;q=0.5',
-            'Accept-Encoding': 'gzip, deflate, br',
-            'Connection': 'keep-alive',
-            'Upgrade-Insecure-Requests': '1',
-            'Sec-Fetch-Dest': 'document',
-            'Sec-Fetch-Mode': 'navigate',
-            'Sec-Fetch-Site': 'none',
-            'Cache-Control': 'max-age=0'
-        }
+    def __init__(self, products, session=None):
+        self._log = logging.getLogger('pokemon_stock_bot')
+        self.products = products
+        self.session = session or make_session()
+        self.interval = CHECK_INTERVAL
+        self.check_count = 0
+        # Set by SIGUSR1 to cut the current wait short
+        self._woken = False
+        self._last_feed_poll = float('-inf')
+        # Checks every product at once over the shared session
+        self._checkers = ThreadPoolExecutor(max_workers=CHECK_WORKERS)
+        # Runs slow side work (SMS) off the monitor thread
+        self._pool = ThreadPoolExecutor(max_workers=2)
         self.twilio_client = None
         if TWILIO_ACCOUNT_SID and TWILIO_AUTH_TOKEN:
             try:
-                self.twilio_client = Client(TWILIO_ACCOUNT_SID, TWILIO_AUTH_TOKEN)
+                # Twilio's HTTP client has no timeout by default, and the SMS
+                # pool is joined at exit before the cookies are saved
+                self.twilio_client = Client(TWILIO_ACCOUNT_SID, TWILIO_AUTH_TOKEN,
+                                            http_client=TwilioHttpClient(timeout=SMS_TIMEOUT))
             except Exception:
-                print("⚠️  Twilio credentials invalid")
+                self._log.warning("⚠️  Twilio credentials invalid")
         
-    def log(self, message):
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        print(f"[{timestamp}] {message}", flush=True)
+        self.load_cookies()
+        atexit.register(self.save_cookies)
+        self.warm_up()
+        
+    def load_cookies(self):
+        """Restore cookies saved by a previous run so bot checks aren't repeated"""
+        try:
+            with open(COOKIE_FILE, 'rb') as f:
+                saved = orjson.loads(f.read())
+            # Check every entry first so a bad file can't leave half a jar
+            cookies = []
+            for entry in saved:
+                name, value, domain, path, expires = entry
+                if not all(isinstance(v, str) for v in (name, value, domain, path)):
+                    raise ValueError(f"bad cookie entry: {entry!r}")
+                if expires is not None and not isinstance(expires, int):
+                    raise ValueError(f"bad cookie expiry: {entry!r}")
+                cookies.append((name, value, domain, path, expires))
+            for name, value, domain, path, expires in cookies:
+                self.session.cookies.set(name, value, domain=domain, path=path, expires=expires)
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            self._log.warning("⚠️  Could not load saved cookies: %s", e)
+    
+    def save_cookies(self):
+        """Save session cookies for the next run"""
+        try:
+            # Plain data rather than pickle, so loading the file can't run code
+            saved = [(c.name, c.value, c.domain, c.path, c.expires) for c in self.session.cookies]
+            with open(COOKIE_FILE, 'wb') as f:
+                f.write(orjson.dumps(saved))
+        except OSError as e:
+            self._log.warning("⚠️  Could not save cookies: %s", e)
+    
+    def warm_up(self):
+        """Open the pooled connection now so the first check skips DNS and TLS setup"""
+        try:
+            self.session.head(SITE_URL, timeout=10)
+        except requests.exceptions.RequestException:
+            pass
     
     def send_sms(self, message):
         """Send SMS via Twilio"""
         if not self.twilio_client:
-            self.log("❌ SMS not configured")
+            self._log.warning("❌ SMS not configured")
             return False
         
         try:
@@ -61,118 +224,309 @@ class PokemonCenterMonitor:
                 from_=TWILIO_PHONE_FROM,
                 to=TWILIO_PHONE_TO
             )
-            self.log(f"✅ SMS sent! SID: {msg.sid}")
+            self._log.info("✅ SMS sent! SID: %s", msg.sid)
             return True
         except Exception as e:
-            self.log(f"❌ SMS failed: {str(e)}")
+            self._log.error("❌ SMS failed: %s", e)
             return False
     
-    def check_stock(self):
+    def quick_check(self, content):
+        """Decide stock from the add-to-cart button markup, or None if unclear"""
+        match = BTN_RE.search(content)
+        if match is None:
+            return None
+        
+        if DISABLED_RE.search(match.group(0)):
+            self._log.debug("❌ Add to cart button disabled")
+            return False
+        
+        if SOLD_OUT_RE.search(content):
+            self._log.debug("❌ 'Out of Stock' text detected")
+            return False
+        
+        self._log.info("✅ Method 1: Add to cart button found!")
+        return True
+    
+    def parse_stock(self, content):
+        """Work out stock status from the product page HTML"""
+        quick = self.quick_check(content)
+        if quick is not None:
+            return quick
+        
+        soup = BeautifulSoup(content, 'lxml', parse_only=ONLY_STOCK_MARKUP)
+        
+        in_stock = False
+        
+        # Method 1: Check for "Add to Cart" button
+        add_to_cart_btn = soup.find('button', {'class': lambda x: x and 'add-to-cart' in x.lower()})
+        if add_to_cart_btn and 'disabled' not in add_to_cart_btn.get('class', []):
+            in_stock = True
+            self._log.info("✅ Method 1: Add to cart button found!")
+        
+        # Method 2: Check availability text
+        availability = soup.find('p', {'class': lambda x: x and 'availability' in x.lower()})
+        if availability:
+            text = availability.get_text().lower()
+            if 'in stock' in text or 'available' in text:
+                in_stock = True
+                self._log.info("✅ Method 2: 'In Stock' text found!")
+            elif 'out of stock' in text or 'sold out' in text:
+                self._log.info("❌ Out of stock")
+        
+        # Method 3: Check for out of stock indicators
+        # (the strained soup only holds the elements above, so scan the raw page)
+        if SOLD_OUT_RE.search(content):
+            in_stock = False
+            self._log.info("❌ 'Out of Stock' text detected")
+        
+        # Method 4: Check structured data (JSON-LD)
+        json_ld = soup.find('script', {'type': 'application/ld+json'})
+        if json_ld:
+            try:
+                data = orjson.loads(json_ld.get_text())
+                if isinstance(data, list):
+                    data = data[0]
+                if 'offers' in data:
+                    availability_str = data['offers'].get('availability', '').lower()
+                    if 'instock' in availability_str:
+                        in_stock = True
+                        self._log.info("✅ Method 4: JSON-LD shows in stock!")
+            except:
+                pass
+        
+        return in_stock
+    
+    def parse_api(self, data):
+        """Work out stock status from the stock API JSON, or None if unknown"""
+        if isinstance(data, list) and data:
+            data = data[0]
+        if not isinstance(data, dict):
+            return None
+        
+        if 'availability' in data:
+            # Compare whole values: 'NOT_IN_STOCK' must not count as 'instock'.
+            # schema.org URLs are reduced to their last segment first.
+            value = str(data['availability']).rsplit('/', 1)[-1]
+            value = re.sub(r'[^a-z]', '', value.lower())
+            if value in IN_STOCK_VALUES:
+                return True
+            if value in OUT_OF_STOCK_VALUES:
+                return False
+            return None
+        
+        if 'stock' in data:
+            stock = data['stock']
+            if isinstance(stock, (bool, int, float)):
+                return stock > 0
+        
+        return None
+    
+    def check_api(self, product):
+        """Check stock via the JSON API, or None to fall back to the page"""
+        response = self.session.get(product.api_url, headers=API_HEADERS, timeout=15)
+        
+        if response.status_code != 200:
+            self._log.warning("⚠️  %s: Stock API HTTP %s, scraping page instead", product.name, response.status_code)
+            return None
+        
+        try:
+            in_stock = self.parse_api(orjson.loads(response.content))
+        except ValueError:
+            self._log.warning("⚠️  %s: Stock API returned invalid JSON, scraping page instead", product.name)
+            return None
+        
+        if in_stock is None:
+            self._log.warning("⚠️  %s: Stock API response not recognised, scraping page instead", product.name)
+        elif in_stock:
+            self._log.info("✅ %s: Stock API shows in stock!", product.name)
+        else:
+            self._log.debug("❌ %s: Stock API shows out of stock", product.name)
+        return in_stock
+    
+    def check_stock(self, product):
         """Check if product is in stock"""
         try:
-            self.log(f"🔍 Checking: {PRODUCT_NAME}")
+            # Once the API has failed, go straight to the page for a while
+            # rather than paying for both requests on every check
+            if product.api_url and time.monotonic() >= product.api_retry_at:
+                try:
+                    in_stock = self.check_api(product)
+                except requests.exceptions.RequestException as e:
+                    self._log.warning("⚠️  %s: Stock API error (%s), scraping page instead", product.name, e)
+                    in_stock = None
+                if in_stock is not None:
+                    return in_stock
+                product.api_retry_at = time.monotonic() + STOCK_API_RETRY
             
-            response = self.session.get(PRODUCT_URL, headers=self.headers, timeout=15)
+            # Conditional GET: an unchanged page comes back as an empty 304.
+            # The body is always read in full so the connection returns to the pool.
+            response = self.session.get(product.url, headers=product.cond_headers, timeout=15)
+            
+            if response.status_code == 304:
+                self._log.debug("♻️  %s: Page unchanged (304)", product.name)
+                return product.last_status
             
             if response.status_code == 403:
-                self.log("⚠️  Bot protection detected (403). Retrying with delay...")
+                self._log.warning("⚠️  %s: Bot protection detected (403). Retrying with delay...", product.name)
                 time.sleep(5)
                 return None
             
             if response.status_code != 200:
-                self.log(f"❌ HTTP {response.status_code}")
+                self._log.warning("❌ %s: HTTP %s", product.name, response.status_code)
                 return None
             
-            soup = BeautifulSoup(response.text, 'html.parser')
-            
-            in_stock = False
-            
-            # Method 1: Check for "Add to Cart" button
-            add_to_cart_btn = soup.find('button', {'class': lambda x: x and 'add-to-cart' in x.lower()})
-            if add_to_cart_btn and 'disabled' not in add_to_cart_btn.get('class', []):
-                in_stock = True
-                self.log("✅ Method 1: Add to cart button found!")
-            
-            # Method 2: Check availability text
-            availability = soup.find('p', {'class': lambda x: x and 'availability' in x.lower()})
-            if availability:
-                text = availability.get_text().lower()
-                if 'in stock' in text or 'available' in text:
-                    in_stock = True
-                    self.log("✅ Method 2: 'In Stock' text found!")
-                elif 'out of stock' in text or 'sold out' in text:
-                    self.log("❌ Out of stock")
-            
-            # Method 3: Check for out of stock indicators
-            out_of_stock = soup.find(string=lambda x: x and ('out of stock' in x.lower() or 'sold out' in x.lower()))
-            if out_of_stock:
-                in_stock = False
-                self.log("❌ 'Out of Stock' text detected")
-            
-            # Method 4: Check structured data (JSON-LD)
-            json_ld = soup.find('script', {'type': 'application/ld+json'})
-            if json_ld:
-                import json
-                try:
-                    data = json.loads(json_ld.string)
-                    if isinstance(data, list):
-                        data = data[0]
-                    if 'offers' in data:
-                        availability_str = data['offers'].get('availability', '').lower()
-                        if 'instock' in availability_str:
-                            in_stock = True
-                            self.log("✅ Method 4: JSON-LD shows in stock!")
-                except:
-                    pass
-            
-            return in_stock
+            product.last_status = self.parse_stock(response.content)
+            product.cond_headers = {}
+            if 'ETag' in response.headers:
+                product.cond_headers['If-None-Match'] = response.headers['ETag']
+            if 'Last-Modified' in response.headers:
+                product.cond_headers['If-Modified-Since'] = response.headers['Last-Modified']
+            return product.last_status
             
         except requests.exceptions.Timeout:
-            self.log("⏱️  Request timeout")
+            self._log.warning("⏱️  %s: Request timeout", product.name)
             return None
         except Exception as e:
-            self.log(f"❌ Error: {str(e)}")
+            self._log.error("❌ %s: Error: %s", product.name, e)
             return None
             
-    def notify(self):
-        message = (
-            f"IN STOCK: {PRODUCT_NAME}\n"
-            f"{PRODUCT_URL}"
-        )
-        self.log("📢 ITEM IN STOCK! Sending notification...")
-        self.send_sms(message)
+    def notify(self, product):
+        self._log.info("📢 %s IN STOCK! Sending notification...", product.name)
+        # Twilio is slow to answer; don't hold up the next stock check on it
+        self._pool.submit(self.send_sms, product.sms_message)
         
-    def run(self):
-        """Main monitoring loop"""
-        self.log("🤖 Pokemon Center Stock Monitor Starting...")
-        self.log(f"📦 Monitoring: {PRODUCT_NAME}")
-        self.log(f"⏱️  Check interval: {CHECK_INTERVAL} seconds")
-        self.log(f"🔗 URL: {PRODUCT_URL}")
-        self.log("=" * 60)
+    def next_interval(self, changed):
+        """Back off while nothing changes, snap back to CHECK_INTERVAL on a change"""
+        if changed:
+            self.interval = CHECK_INTERVAL
+        else:
+            self.interval = min(self.interval * 1.3, CHECK_INTERVAL_MAX)
+        # Jitter so restarts and parallel bots don't settle into lockstep
+        return self.interval * random.uniform(0.8, 1.2)
+    
+    def wake(self, *_):
+        """SIGUSR1 handler; only sets a flag, since taking a lock here could deadlock"""
+        self._woken = True
+    
+    def sleep(self, seconds):
+        """Wait between checks, returning early on a SIGUSR1 restock signal"""
+        deadline = time.monotonic() + seconds
+        while not self._woken:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return
+            time.sleep(min(remaining, 1))
+        self._woken = False
+        self._log.info("📨 Wake-up signal received, checking now")
+    
+    def listen(self):
+        """Re-check stock on each RESTOCK_FEED_URL event until the stream drops"""
+        self._log.info("📡 Listening for restock events: %s", RESTOCK_FEED_URL)
+        try:
+            # Feeds send keep-alive comments, so 5 quiet minutes means it's dead
+            with self.session.get(RESTOCK_FEED_URL, headers={'Accept': 'text/event-stream'},
+                                  stream=True, timeout=(15, 300)) as response:
+                if response.status_code != 200:
+                    self._log.warning("❌ Restock feed HTTP %s", response.status_code)
+                    return
+                
+                has_data = False
+                pending = False
+                for line in response.iter_lines():
+                    if line.startswith(b'data:'):
+                        has_data = True
+                    elif not line and has_data:
+                        # A blank line ends the event
+                        has_data = False
+                        pending = True
+                        self._log.info("📨 Restock event received")
+                    
+                    # SIGUSR1 can't interrupt the blocking read, so it is picked
+                    # up here on the next line and checked straight away
+                    if self._woken:
+                        self._woken = False
+                        pending = False
+                        self._last_feed_poll = time.monotonic()
+                        self._log.info("📨 Wake-up signal received, checking now")
+                        self.poll_once()
+                    # A busy relay must not push checks past what the site
+                    # tolerates, so events inside FEED_MIN_GAP wait for the
+                    # next line (keep-alive comments arrive regularly)
+                    elif pending and time.monotonic() - self._last_feed_poll >= FEED_MIN_GAP:
+                        pending = False
+                        self._last_feed_poll = time.monotonic()
+                        self.poll_once()
+        except requests.exceptions.RequestException as e:
+            self._log.warning("❌ Restock feed error: %s", e)
+    
+    def poll_once(self):
+        """Check every product once and return how long to wait before the next round"""
+        self.check_count += 1
         
-        check_count = 0
+        now = time.monotonic()
+        due = [product for product in self.products if now >= product.next_check_at]
+        statuses = list(self._checkers.map(self.check_stock, due))
         
-        while True:
-            check_count += 1
-            self.log(f"Check #{check_count}")
-            
-            stock_status = self.check_stock()
-            
+        changed = False
+        summaries = [f"{product.name}: ⏸️  Paused after restock alert"
+                     for product in self.products if now < product.next_check_at]
+        for product, stock_status in zip(due, statuses):
             if stock_status is True:
-                self.log("🎉 ITEM IS IN STOCK!")
-                self.notify()
-                # Keep checking but less frequently after notification
-                self.log("Waiting 5 minutes before next check...")
-                time.sleep(300)
+                # One SMS per restock: only on the change into stock
+                if product.previous_status is not True:
+                    self._log.info("🎉 %s IS IN STOCK!", product.name)
+                    self.notify(product)
+                # Keep checking this one, but less frequently after notification
+                product.next_check_at = time.monotonic() + RESTOCK_PAUSE
+                summary = "🎉 In stock"
             elif stock_status is False:
-                self.log("😔 Still out of stock")
+                summary = "😔 Still out of stock"
             else:
-                self.log("⚠️  Could not determine stock status")
+                summary = "⚠️  Could not determine stock status"
+            summaries.append(f"{product.name}: {summary}")
+            
+            if stock_status is not None:
+                changed = changed or stock_status != product.previous_status
+                product.previous_status = stock_status
+        
+        interval = self.next_interval(changed)
+        
+        # One line per check; the separator only every so often
+        if self.check_count % LOG_SEPARATOR_EVERY == 0:
+            self._log.info("-" * 60)
+        self._log.info("Check #%d: %s (interval %.0fs)", self.check_count, '; '.join(summaries), interval)
+        return interval
+    
+    def run(self):
+        """Main monitoring loop"""
+        self._log.info("🤖 Pokemon Center Stock Monitor Starting...")
+        for product in self.products:
+            self._log.info("📦 Monitoring: %s", product.name)
+            self._log.info("🔗 URL: %s", product.url)
+        self._log.info("⏱️  Check interval: %s-%s seconds", CHECK_INTERVAL, CHECK_INTERVAL_MAX)
+        self._log.info("=" * 60)
+        
+        # Exit cleanly on SIGTERM (e.g. a redeploy) so atexit saves the cookies
+        signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+        # e.g. `kill -USR1 <pid>` from a script watching restock accounts.
+        # With a restock feed it takes effect on the feed's next line.
+        if hasattr(signal, 'SIGUSR1'):
+            signal.signal(signal.SIGUSR1, self.wake)
+        
+        while True:
+            # With a restock feed, only poll while it's disconnected
+            if RESTOCK_FEED_URL:
+                self.listen()
+                self._log.warning("⚠️  Restock feed dropped, polling until it reconnects")
             
-            self.log(f"💤 Sleeping for {CHECK_INTERVAL} seconds...")
-            self.log("-" * 60)
-            time.sleep(CHECK_INTERVAL)
+            self.sleep(self.poll_once())
 
 if __name__ == "__main__":
-    monitor = PokemonCenterMonitor()
+    logging.basicConfig(
+        stream=sys.stdout,
+        level=logging.INFO,
+        format='[%(asctime)s] %(message)s',
+        datefmt='%Y-%m-%d %H:%M:%S',
+    )
+    monitor = PokemonCenterMonitor(PRODUCTS, make_session())
     monitor.run()
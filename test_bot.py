@@ -0,0 +1,176 @@
+import bot
+
+
+def make_monitor():
+    # parse_stock() only needs the logger, so skip the network setup in __init__
+    monitor = bot.PokemonCenterMonitor.__new__(bot.PokemonCenterMonitor)
+    monitor._log = bot.logging.getLogger('test')
+    return monitor
+
+
+def test_quick_check_enabled_button_with_aria_disabled_false():
+    page = b'<button class="add-to-cart-button" aria-disabled="false">Add to Cart</button>'
+    assert make_monitor().parse_stock(page) is True
+
+
+def test_quick_check_disabled_button():
+    page = b'<button class="add-to-cart-button" aria-disabled="true" disabled>Add to Cart</button>'
+    assert make_monitor().parse_stock(page) is False
+
+
+def test_parse_api_matches_whole_availability_values():
+    monitor = make_monitor()
+    assert monitor.parse_api({'availability': 'IN_STOCK'}) is True
+    assert monitor.parse_api({'availability': 'https://schema.org/InStock'}) is True
+    assert monitor.parse_api({'availability': 'NOT_IN_STOCK'}) is False
+    assert monitor.parse_api({'availability': 'not in stock'}) is False
+    assert monitor.parse_api({'availability': 'coming soon'}) is None
+
+
+def test_api_connection_error_falls_back_to_page(monkeypatch):
+    class Session:
+        def get(self, url, **kwargs):
+            if url == 'api':
+                raise bot.requests.exceptions.ConnectionError('down')
+            return Response()
+
+    class Response:
+        status_code = 200
+        headers = {}
+        content = b'<button class="add-to-cart-button" disabled>Add to Cart</button>'
+
+    monitor = make_monitor()
+    monitor.session = Session()
+    product = bot.Product(url='page', name='Test', api_url='api')
+
+    assert monitor.check_stock(product) is False
+    assert product.api_retry_at > 0
+
+
+def test_restock_pauses_only_that_product():
+    checked = []
+
+    def check_stock(product):
+        checked.append(product.name)
+        return product.name == 'A'
+
+    monitor = make_monitor()
+    monitor.products = [bot.Product(url='a', name='A'), bot.Product(url='b', name='B')]
+    monitor.check_stock = check_stock
+    monitor.notify = lambda product: None
+    monitor._checkers = bot.ThreadPoolExecutor(max_workers=2)
+    monitor.check_count = 0
+    monitor.interval = bot.CHECK_INTERVAL
+
+    monitor.poll_once()
+    monitor.poll_once()
+
+    # The pool may run the checks in either order
+    assert sorted(checked) == ['A', 'B', 'B']
+    assert monitor.products[0].next_check_at > 0
+    assert monitor.products[1].next_check_at == 0
+
+
+def test_listen_checks_once_per_event_and_delays_events_inside_min_gap(monkeypatch):
+    clock = [1000.0]
+    monkeypatch.setattr(bot.time, 'monotonic', lambda: clock[0])
+
+    class Response:
+        status_code = 200
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc):
+            pass
+
+        def iter_lines(self):
+            # One two-line event, then a second event right after it
+            yield from [b'data: restock', b'data: more', b'', b'data: again', b'']
+            # A keep-alive comment once the gap has passed
+            clock[0] += bot.FEED_MIN_GAP
+            yield b': keep-alive'
+
+    class Session:
+        def get(self, url, **kwargs):
+            return Response()
+
+    polls = []
+    monitor = make_monitor()
+    monitor.session = Session()
+    monitor._woken = False
+    monitor._last_feed_poll = float('-inf')
+    monitor.poll_once = lambda: polls.append(clock[0])
+
+    monitor.listen()
+
+    assert polls == [1000.0, 1000.0 + bot.FEED_MIN_GAP]
+
+
+def test_cookies_round_trip_and_bad_file(tmp_path, monkeypatch):
+    monkeypatch.setattr(bot, 'COOKIE_FILE', str(tmp_path / 'cookies.json'))
+    monitor = make_monitor()
+    monitor.session = bot.requests.Session()
+    monitor.session.cookies.set('cf_clearance', 'abc', domain='.pokemoncenter.com', path='/')
+    monitor.save_cookies()
+
+    monitor.session = bot.requests.Session()
+    monitor.load_cookies()
+    assert monitor.session.cookies.get('cf_clearance', domain='.pokemoncenter.com') == 'abc'
+
+    # Valid JSON of the wrong shape is logged, not raised, and sets nothing
+    for bad in ('[1, 2]', '[["ok", "1", ".pokemoncenter.com", "/", null], ["bad", 2]]'):
+        (tmp_path / 'cookies.json').write_text(bad)
+        monitor.session = bot.requests.Session()
+        monitor.load_cookies()
+        assert len(monitor.session.cookies) == 0
+
+
+def test_listen_checks_immediately_on_wake_signal():
+    monitor = make_monitor()
+
+    class Response:
+        status_code = 200
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc):
+            pass
+
+        def iter_lines(self):
+            yield b': keep-alive'
+            monitor.wake()
+            yield b': keep-alive'
+
+    class Session:
+        def get(self, url, **kwargs):
+            return Response()
+
+    polls = []
+    monitor.session = Session()
+    monitor._woken = False
+    monitor._last_feed_poll = float('-inf')
+    monitor.poll_once = lambda: polls.append(1)
+
+    monitor.listen()
+
+    assert polls == [1]
+    assert monitor._woken is False
+
+
+def test_continuous_stock_sends_one_sms():
+    notified = []
+    monitor = make_monitor()
+    monitor.products = [bot.Product(url='a', name='A')]
+    monitor.check_stock = lambda product: True
+    monitor.notify = notified.append
+    monitor._checkers = bot.ThreadPoolExecutor(max_workers=1)
+    monitor.check_count = 0
+    monitor.interval = bot.CHECK_INTERVAL
+
+    for _ in range(10):
+        monitor.products[0].next_check_at = 0.0  # e.g. feed or SIGUSR1 re-checks
+        monitor.poll_once()
+
+    assert len(notified) == 1